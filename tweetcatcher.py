@@ -1,15 +1,17 @@
-import websocket
-import json
-import time
+import websockets
+import orjson
 import ssl
-import requests
-from datetime import datetime
+import aiohttp
 import discord
 from discord.ext import commands
 import asyncio
 import os
-from urllib.parse import urlparse
+import re
+import sys
+from urllib.parse import urlsplit
 import logging
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Chargement des variables d'environnement
@@ -24,6 +26,7 @@ logging.basicConfig(
         logging.StreamHandler()
     ]
 )
+logger = logging.getLogger(__name__)
 
 # Configuration
 WEBSOCKET_URL = 'wss://pumpportal.fun/api/data'
@@ -32,76 +35,95 @@ CHANNEL_ID = int(os.getenv('CHANNEL_ID'))
 ALLOWED_ACCOUNTS_FILE = 'allowed_accounts.txt'
 TWEET_BLACKLIST_FILE = 'tweet_blacklist.txt'
 REQUEST_TIMEOUT = 10
+SEND_BATCH_DELAY = 0.5  # secondes de regroupement avant envoi
+DISCORD_MAX_LENGTH = 2000
+LINKS_CACHE_SIZE = 4096
+TWEET_MESSAGE_PREFIX = "🔔 Nouveau tweet de @"
+BLACKLIST_FLUSH_INTERVAL = 1  # secondes entre deux écritures de la blacklist
+BLACKLIST_FLUSH_SIZE = 64 * 1024  # écriture immédiate au-delà de 64 Ko en attente
+ALLOWED_ACCOUNTS_POLL_INTERVAL = 5  # secondes entre deux vérifications du fichier
+MESSAGE_QUEUE_SIZE = 1024
+HTTP_CONCURRENCY = 32  # requêtes de métadonnées simultanées (= connexions du pool)
+MESSAGE_WORKERS = HTTP_CONCURRENCY
+
+# Hôtes Twitter reconnus et extraction du compte et de l'ID du tweet depuis le chemin
+_TW_HOSTS = frozenset({
+    'x.com', 'www.x.com', 'mobile.x.com',
+    'twitter.com', 'www.twitter.com', 'mobile.twitter.com'
+})
+_TWITTER_PATH_RE = re.compile(r'/([A-Za-z0-9_]+)(?:/status/(\d+)(?:/|$))?')
+
+# Sous un Python sans GIL (3.13t), le décodage des messages est réparti sur plusieurs
+# threads ; avec le GIL, il reste sur la boucle d'événements où il est moins coûteux
+FREE_THREADED = not getattr(sys, '_is_gil_enabled', lambda: True)()
+_parse_executor = ThreadPoolExecutor(max_workers=4) if FREE_THREADED else None
+
+# Extraction des données du token selon le format du message WebSocket
+_DISPATCH_FIELDS = ('method', 'type', 'event', 'txType')
+_DISPATCH = {
+    ('method', 'newToken'): lambda d: d['params'],
+    ('type', 'newToken'): lambda d: d,
+    ('event', 'token_created'): lambda d: d['data'],
+    ('txType', 'create'): lambda d: d if 'mint' in d else None,
+}
 
 # Vérification des variables d'environnement
 if not DISCORD_TOKEN or not CHANNEL_ID:
-    logging.error("Variables d'environnement manquantes. Vérifiez votre fichier .env")
+    logger.error("Variables d'environnement manquantes. Vérifiez votre fichier .env")
     exit(1)
 
-# Initialisation des listes
-tweet_blacklist = []
-allowed_accounts = []
+# Initialisation des ensembles (recherche en O(1))
+tweet_blacklist = set()
+allowed_accounts = frozenset()
 
-def load_allowed_accounts():
-    """Charge la liste des comptes autorisés"""
+def load_allowed_accounts(default=frozenset()):
+    """Charge la liste des comptes autorisés (retourne `default` si le fichier est absent)"""
     try:
         with open(ALLOWED_ACCOUNTS_FILE, 'r') as f:
-            return [line.strip().lower() for line in f if line.strip()]
+            return frozenset(sys.intern(line.strip().lower()) for line in f if line.strip())
     except FileNotFoundError:
-        logging.error(f"Fichier {ALLOWED_ACCOUNTS_FILE} non trouvé")
-        return []
+        logger.error("Fichier %s non trouvé", ALLOWED_ACCOUNTS_FILE)
+        return default
 
 def load_tweet_blacklist():
     """Charge la liste des tweets déjà traités"""
     try:
         with open(TWEET_BLACKLIST_FILE, 'r') as f:
-            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            return {line.strip() for line in f if line.strip() and not line.startswith('#')}
     except FileNotFoundError:
-        logging.error(f"Fichier {TWEET_BLACKLIST_FILE} non trouvé")
-        return []
+        logger.error("Fichier %s non trouvé", TWEET_BLACKLIST_FILE)
+        return set()
 
-def save_to_blacklist(tweet_id, account_name):
-    """Sauvegarde un tweet dans la blacklist"""
+def parse_twitter_link(twitter_link):
+    """Extrait le nom du compte et l'ID du tweet depuis l'URL Twitter"""
     try:
-        with open(TWEET_BLACKLIST_FILE, 'a') as f:
-            f.write(f"{tweet_id}|{account_name}\n")
-        tweet_blacklist.append(f"{tweet_id}|{account_name}")
+        twitter_link = twitter_link.strip()
+        if '//' not in twitter_link:
+            twitter_link = 'https://' + twitter_link
+        parts = urlsplit(twitter_link)
+        if parts.hostname not in _TW_HOSTS:
+            return None, None
+        match = _TWITTER_PATH_RE.match(parts.path)
+        if not match:
+            return None, None
+        return match.group(1).lower(), match.group(2)
     except Exception as e:
-        logging.error(f"Erreur lors de la sauvegarde dans la blacklist: {e}")
+        logger.error("Erreur lors de l'analyse du lien Twitter: %s", e)
+        return None, None
 
-def extract_account_name(twitter_link):
-    """Extrait le nom du compte depuis l'URL Twitter"""
-    try:
-        if '#' in twitter_link:
-            twitter_link = twitter_link.split('#')[0]
-        
-        if '/status/' in twitter_link:
-            twitter_link = twitter_link.split('/status/')[0]
-            
-        parts = twitter_link.split('/')
-        for i, part in enumerate(parts):
-            if part in ['x.com', 'twitter.com'] and i + 1 < len(parts):
-                account_name = parts[i + 1].lower()
-                # Si le nom du compte contient des caractères spéciaux, on le nettoie
-                account_name = ''.join(c for c in account_name if c.isalnum() or c == '_')
-                return account_name
-        return None
-    except Exception as e:
-        logging.error(f"Erreur lors de l'extraction du nom du compte: {e}")
-        return None
+# Liens d'un token (immuable pour pouvoir être mis en cache)
+Links = namedtuple('Links', 'twitter website telegram')
 
-def extract_tweet_id(twitter_link):
-    """Extrait l'ID du tweet depuis l'URL Twitter"""
-    try:
-        if '/status/' in twitter_link:
-            return twitter_link.split('/status/')[1].split('#')[0].split('?')[0]
-        return None
-    except Exception as e:
-        logging.error(f"Erreur lors de l'extraction de l'ID du tweet: {e}")
-        return None
+# Cache LRU des liens déjà récupérés, indexé par URI
+_links_cache = OrderedDict()
+
+async def get_token_links(session, semaphore, uri):
+    """Récupère les liens depuis les métadonnées du token (URI HTTP(S) déjà validée)"""
+    cached = _links_cache.get(uri)
+    if cached is not None:
+        _links_cache.move_to_end(uri)
+        return cached
 
-def get_token_links(uri):
-    """Récupère les liens depuis les métadonnées du token"""
     links = {
         'twitter': 'Non disponible',
         'website': 'Non disponible',
@@ -109,180 +131,371 @@ def get_token_links(uri):
     }
     
     try:
-        if not uri:
-            return links
-            
-        response = requests.get(uri, timeout=REQUEST_TIMEOUT)
-        if response.status_code == 200:
-            metadata = response.json()
-            
-            # Recherche dans les propriétés
-            if 'properties' in metadata and 'links' in metadata['properties']:
-                links_data = metadata['properties']['links']
-                links.update({
-                    'twitter': links_data.get('twitter', links['twitter']),
-                    'website': links_data.get('website', links['website']),
-                    'telegram': links_data.get('telegram', links['telegram'])
-                })
-            
-            # Recherche directe dans les métadonnées
+        async with semaphore, session.get(uri) as response:
+            if response.status != 200:
+                return Links(**links)
+            metadata = await response.json(loads=orjson.loads, content_type=None)
+
+        # Recherche dans les propriétés
+        if 'properties' in metadata and 'links' in metadata['properties']:
+            links_data = metadata['properties']['links']
             links.update({
-                'twitter': metadata.get('twitter', metadata.get('twitter_link', links['twitter'])),
-                'website': metadata.get('website', metadata.get('website_link', links['website'])),
-                'telegram': metadata.get('telegram', metadata.get('telegram_link', links['telegram']))
+                'twitter': links_data.get('twitter', links['twitter']),
+                'website': links_data.get('website', links['website']),
+                'telegram': links_data.get('telegram', links['telegram'])
             })
-    except requests.Timeout:
-        logging.warning(f"Timeout lors de la récupération des métadonnées: {uri}")
+
+        # Recherche directe dans les métadonnées
+        links.update({
+            'twitter': metadata.get('twitter', metadata.get('twitter_link', links['twitter'])),
+            'website': metadata.get('website', metadata.get('website_link', links['website'])),
+            'telegram': metadata.get('telegram', metadata.get('telegram_link', links['telegram']))
+        })
+
+        # Seules les métadonnées effectivement lues sont mises en cache
+        result = Links(**links)
+        _links_cache[uri] = result
+        if len(_links_cache) > LINKS_CACHE_SIZE:
+            _links_cache.popitem(last=False)
+        return result
+    except asyncio.TimeoutError:
+        logger.warning("Timeout lors de la récupération des métadonnées: %s", uri)
     except Exception as e:
-        logging.error(f"Erreur lors de la récupération des métadonnées: {e}")
-    
-    return links
+        logger.error("Erreur lors de la récupération des métadonnées: %s", e)
+
+    return Links(**links)
 
 class TweetCatcherBot(commands.Bot):
     def __init__(self):
         # Configuration des intents de base uniquement
         intents = discord.Intents.default()
         super().__init__(command_prefix='!', intents=intents)
-        
+        # Tweets en attente d'envoi groupé
+        self._pending: list[str] = []
+        self._flush_handle = None
+        self._flush_task = None
+        self._closing = False
+        self._background_tasks = []
+        self._http = None
+        self._http_semaphore = None
+        self._bl_fd = None
+        self._bl_buf = bytearray()
+        self._bl_dirty = False
+        self._fsync_task = None
+        self._queue = None
+        self._dropped = 0
+        self._channel_ready = None
+
     async def setup_hook(self):
         """Configuration initiale du bot"""
         self.channel = None
-        self.websocket_thread = None
+        # Session HTTP partagée : connexions keep-alive réutilisées entre les tokens
+        self._http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_CONCURRENCY, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        )
+        # Limite les requêtes simultanées à la taille du pool de connexions
+        self._http_semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+        # Signalé par on_ready uniquement quand le canal Discord est trouvé
+        self._channel_ready = asyncio.Event()
+        # Descripteur de la blacklist gardé ouvert en ajout pour toute la durée du bot
+        self._bl_fd = os.open(TWEET_BLACKLIST_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self.blacklist_task = asyncio.create_task(self._blacklist_flusher())
+        self.accounts_task = asyncio.create_task(self._watch_allowed_accounts())
+        # File bornée entre la lecture du WebSocket et le traitement des tokens
+        self._queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+        self.worker_tasks = [asyncio.create_task(self._worker()) for _ in range(MESSAGE_WORKERS)]
+        self.ws_task = asyncio.create_task(self._ws_loop())
+        self._background_tasks = [self.ws_task, *self.worker_tasks, self.accounts_task, self.blacklist_task]
         
     async def on_ready(self):
         """Événement déclenché quand le bot est prêt"""
-        logging.info(f'Bot connecté en tant que {self.user.name}')
+        logger.info("Bot connecté en tant que %s", self.user.name)
         
         # Afficher les serveurs disponibles
         for guild in self.guilds:
-            logging.info(f"Serveur trouvé: {guild.name} (ID: {guild.id})")
+            logger.info("Serveur trouvé: %s (ID: %s)", guild.name, guild.id)
             # Afficher les canaux disponibles
             for channel in guild.channels:
-                logging.info(f"- Canal: {channel.name} (ID: {channel.id})")
+                logger.info("- Canal: %s (ID: %s)", channel.name, channel.id)
         
         # Récupération du canal
         self.channel = self.get_channel(CHANNEL_ID)
         if not self.channel:
-            logging.error(f"Canal Discord {CHANNEL_ID} non trouvé")
-            logging.error("Vérifiez que:")
-            logging.error("1. Le bot est bien dans le serveur")
-            logging.error("2. L'ID du canal est correct")
-            logging.error("3. Le bot a accès au canal")
+            logger.error("Canal Discord %s non trouvé", CHANNEL_ID)
+            logger.error("Vérifiez que:")
+            logger.error("1. Le bot est bien dans le serveur")
+            logger.error("2. L'ID du canal est correct")
+            logger.error("3. Le bot a accès au canal")
             return
             
-        logging.info(f"Canal trouvé: {self.channel.name} dans {self.channel.guild.name}")
-            
-        # Démarrage du WebSocket
-        try:
-            import threading
-            self.websocket_thread = threading.Thread(target=self.run_websocket, daemon=True)
-            self.websocket_thread.start()
-            logging.info("WebSocket thread démarré")
-        except Exception as e:
-            logging.error(f"Erreur lors du démarrage du WebSocket: {e}")
-        
+        logger.info("Canal trouvé: %s dans %s", self.channel.name, self.channel.guild.name)
+        self._channel_ready.set()
+
     async def send_tweet(self, twitter_link, account_name):
-        """Envoie un tweet dans le canal Discord"""
+        """Met un tweet en attente d'envoi dans le canal Discord"""
         if not self.channel:
-            logging.error("Canal Discord non initialisé")
+            logger.error("Canal Discord non initialisé")
+            return
+
+        self._pending.append(TWEET_MESSAGE_PREFIX + account_name + ":\n" + twitter_link)
+        # Pendant la fermeture, close() envoie lui-même les tweets restants
+        if not self._closing:
+            self._arm_flush()
+
+    def _arm_flush(self):
+        """Programme un envoi groupé, sauf si un envoi est déjà prévu ou en cours"""
+        if self._flush_handle is not None:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_handle = self.loop.call_later(SEND_BATCH_DELAY, self._schedule_flush)
+
+    def _schedule_flush(self):
+        """Lance l'envoi groupé en gardant une référence sur la tâche"""
+        self._flush_handle = None
+        self._flush_task = asyncio.create_task(self._flush())
+        self._flush_task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task):
+        """Reprogramme un envoi pour les tweets arrivés pendant le précédent"""
+        if self._pending and not self._closing:
+            self._arm_flush()
+
+    async def _flush(self):
+        """Envoie les tweets en attente en messages de 2000 caractères maximum"""
+        pending, self._pending = self._pending, []
+
+        chunks = []
+        current = ""
+        for line in pending:
+            # Une ligne trop longue est découpée en morceaux envoyables
+            while len(line) > DISCORD_MAX_LENGTH:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(line[:DISCORD_MAX_LENGTH])
+                line = line[DISCORD_MAX_LENGTH:]
+            if current and len(current) + 1 + len(line) > DISCORD_MAX_LENGTH:
+                chunks.append(current)
+                current = line
+            else:
+                current = f"{current}\n{line}" if current else line
+        if current:
+            chunks.append(current)
+
+        sent = 0
+        for chunk in chunks:
+            try:
+                await self.channel.send(chunk)
+                sent += 1
+            except Exception as e:
+                logger.error("Erreur lors de l'envoi du message Discord: %s", e)
+        if sent:
+            logger.info("%s message(s) envoyé(s) sur %s pour %s tweet(s)", sent, len(chunks), len(pending))
+
+    async def close(self):
+        """Arrête les tâches de fond puis envoie et écrit ce qui reste avant la fermeture"""
+        self._closing = True
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # Un seul envoi peut être en cours : on attend sa fin pour garder l'ordre des messages
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self._pending:
+            await self._flush()
+        if self._http is not None:
+            await self._http.close()
+        if self._bl_fd is not None:
+            if self._fsync_task is not None:
+                await asyncio.gather(self._fsync_task, return_exceptions=True)
+            self._flush_blacklist()
+            try:
+                os.fsync(self._bl_fd)
+            except OSError as e:
+                logger.error("Erreur lors de la synchronisation de la blacklist: %s", e)
+            os.close(self._bl_fd)
+            self._bl_fd = None
+        await super().close()
+
+    def save_to_blacklist(self, tweet_id, account_name):
+        """Sauvegarde un tweet dans la blacklist"""
+        # L'ensemble en mémoire fait foi ; le fichier est écrit par lots
+        tweet_key = f"{tweet_id}|{account_name}"
+        tweet_blacklist.add(tweet_key)
+        if self._bl_fd is None:
+            logger.error("Blacklist fermée, tweet non sauvegardé sur disque: %s", tweet_key)
+            return
+        self._bl_buf += f"{tweet_key}\n".encode()
+        if len(self._bl_buf) > BLACKLIST_FLUSH_SIZE:
+            self._flush_blacklist()
+
+    def _flush_blacklist(self):
+        """Écrit les entrées en attente dans le fichier de blacklist (sans fsync)"""
+        if not self._bl_buf or self._bl_fd is None:
             return
-            
         try:
-            await self.channel.send(f"🔔 Nouveau tweet de @{account_name}:\n{twitter_link}")
-            logging.info(f"Tweet envoyé avec succès: {twitter_link}")
+            while self._bl_buf:
+                written = os.write(self._bl_fd, self._bl_buf)
+                del self._bl_buf[:written]
+                self._bl_dirty = True
         except Exception as e:
-            logging.error(f"Erreur lors de l'envoi du message Discord: {e}")
+            logger.error("Erreur lors de la sauvegarde dans la blacklist: %s", e)
 
-    def process_token(self, token_data):
+    async def _blacklist_flusher(self):
+        """Vide périodiquement le tampon de la blacklist et le synchronise sur disque"""
+        while True:
+            await asyncio.sleep(BLACKLIST_FLUSH_INTERVAL)
+            self._flush_blacklist()
+            if self._bl_dirty:
+                self._bl_dirty = False
+                # fsync hors de la boucle d'événements ; close() attend sa fin avant de fermer le fichier
+                self._fsync_task = asyncio.ensure_future(asyncio.to_thread(os.fsync, self._bl_fd))
+                try:
+                    await asyncio.shield(self._fsync_task)
+                except OSError as e:
+                    logger.error("Erreur lors de la synchronisation de la blacklist: %s", e)
+
+    async def process_token(self, token_data):
         """Traite un nouveau token"""
         try:
             uri = token_data.get('uri', token_data.get('metadataUri', ''))
-            logging.info(f"Traitement du token avec URI: {uri}")
-            
-            links = get_token_links(uri)
-            twitter_link = links['twitter']
+            if not uri or not uri.startswith(('http://', 'https://')):
+                logger.info("URI de métadonnées absente ou invalide: %s", uri)
+                return
+            logger.info("Traitement du token avec URI: %s", uri)
+
+            links = await get_token_links(self._http, self._http_semaphore, uri)
+            twitter_link = links.twitter
 
             if twitter_link == 'Non disponible':
-                logging.info("Aucun lien Twitter trouvé dans les métadonnées")
+                logger.info("Aucun lien Twitter trouvé dans les métadonnées")
                 return
 
-            account_name = extract_account_name(twitter_link)
-            tweet_id = extract_tweet_id(twitter_link)
+            account_name, tweet_id = parse_twitter_link(twitter_link)
 
             if not account_name or not tweet_id:
-                logging.info(f"Impossible d'extraire le nom du compte ou l'ID du tweet: {twitter_link}")
+                logger.info("Impossible d'extraire le nom du compte ou l'ID du tweet: %s", twitter_link)
                 return
 
             # Vérification de la blacklist
             tweet_key = f"{tweet_id}|{account_name}"
             if tweet_key in tweet_blacklist:
-                logging.info(f"Tweet déjà traité: {tweet_key}")
+                logger.info("Tweet déjà traité: %s", tweet_key)
                 return
 
             # Vérification du compte autorisé
             if account_name not in allowed_accounts:
-                logging.info(f"Compte non autorisé: {account_name}")
+                logger.info("Compte non autorisé: %s", account_name)
                 return
 
             # Sauvegarde et envoi
-            save_to_blacklist(tweet_id, account_name)
-            logging.info(f"Nouveau tweet trouvé: {twitter_link}")
-            asyncio.run_coroutine_threadsafe(
-                self.send_tweet(twitter_link, account_name),
-                self.loop
-            )
+            self.save_to_blacklist(tweet_id, account_name)
+            logger.info("Nouveau tweet trouvé: %s", twitter_link)
+            await self.send_tweet(twitter_link, account_name)
             
         except Exception as e:
-            logging.error(f"Erreur lors du traitement du token: {e}")
+            logger.error("Erreur lors du traitement du token: %s", e)
 
-    def on_websocket_message(self, ws, message):
+    async def on_websocket_message(self, message):
         """Gère les messages du WebSocket"""
         try:
-            data = json.loads(message)
-            logging.debug(f"Message WebSocket reçu: {data}")
+            if _parse_executor is not None:
+                data = await self.loop.run_in_executor(_parse_executor, orjson.loads, message)
+            else:
+                data = orjson.loads(message)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Message WebSocket reçu: %s", data)
             
-            if 'method' in data and data['method'] == 'newToken':
-                self.process_token(data['params'])
-            elif 'type' in data and data['type'] == 'newToken':
-                self.process_token(data)
-            elif 'event' in data and data['event'] == 'token_created':
-                self.process_token(data['data'])
-            elif 'mint' in data and 'txType' in data and data['txType'] == 'create':
-                self.process_token(data)
-                
-        except Exception as e:
-            logging.error(f"Erreur lors du traitement du message WebSocket: {e}")
+            if not isinstance(data, dict):
+                return
+
+            # Un seul accès au dictionnaire de dispatch par champ discriminant
+            for field in _DISPATCH_FIELDS:
+                value = data.get(field)
+                if not isinstance(value, str):
+                    continue
+                extract = _DISPATCH.get((field, value))
+                if extract:
+                    token_data = extract(data)
+                    if token_data is not None:
+                        await self.process_token(token_data)
+                    break
 
-    def on_websocket_error(self, ws, error):
-        """Gère les erreurs du WebSocket"""
-        logging.error(f"Erreur WebSocket: {error}")
+        except Exception as e:
+            logger.error("Erreur lors du traitement du message WebSocket: %s", e)
 
-    def on_websocket_close(self, ws, close_status_code, close_msg):
-        """Gère la fermeture du WebSocket"""
-        logging.warning(f"WebSocket fermé: {close_status_code} - {close_msg}")
+    async def _worker(self):
+        """Traite les messages WebSocket mis en file"""
+        while True:
+            message = await self._queue.get()
+            try:
+                await self.on_websocket_message(message)
+            finally:
+                self._queue.task_done()
 
-    def on_websocket_open(self, ws):
-        """Gère l'ouverture du WebSocket"""
-        logging.info("WebSocket connecté, en attente de nouveaux tweets...")
-        ws.send(json.dumps({"method": "subscribeNewToken"}))
-        logging.info("Souscription aux nouveaux tokens envoyée")
+    async def _watch_allowed_accounts(self):
+        """Recharge les comptes autorisés quand le fichier est modifié"""
+        global allowed_accounts
+        try:
+            last_mtime = os.stat(ALLOWED_ACCOUNTS_FILE).st_mtime_ns
+        except OSError:
+            last_mtime = None
+        while True:
+            await asyncio.sleep(ALLOWED_ACCOUNTS_POLL_INTERVAL)
+            try:
+                mtime = os.stat(ALLOWED_ACCOUNTS_FILE).st_mtime_ns
+            except OSError:
+                # Fichier absent ou en cours de remplacement : on garde la liste actuelle
+                continue
+            if mtime != last_mtime:
+                try:
+                    accounts = load_allowed_accounts(default=None)
+                except (OSError, ValueError) as e:
+                    # Fichier illisible (droits, sauvegarde partielle...) : on garde la liste actuelle
+                    logger.error("Erreur lors du rechargement des comptes autorisés: %s", e)
+                    continue
+                if accounts is None:
+                    # Supprimé entre stat et open : nouvel essai au prochain passage
+                    continue
+                last_mtime = mtime
+                allowed_accounts = accounts
+                logger.info("Comptes autorisés rechargés: %s compte(s)", len(allowed_accounts))
 
-    def run_websocket(self):
+    async def _ws_loop(self):
         """Exécute la connexion WebSocket avec reconnexion automatique"""
-        while True:
+        # Sans canal, les tweets seraient blacklistés sans jamais être envoyés
+        await self._channel_ready.wait()
+        ssl_ctx = ssl.create_default_context()
+        ssl_ctx.check_hostname = False
+        ssl_ctx.verify_mode = ssl.CERT_NONE
+        while not self.is_closed():
             try:
-                ws = websocket.WebSocketApp(
-                    WEBSOCKET_URL,
-                    on_open=self.on_websocket_open,
-                    on_message=self.on_websocket_message,
-                    on_error=self.on_websocket_error,
-                    on_close=self.on_websocket_close
-                )
-                ws.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE})
+                async with websockets.connect(WEBSOCKET_URL, ssl=ssl_ctx) as ws:
+                    logger.info("WebSocket connecté, en attente de nouveaux tweets...")
+                    await ws.send(orjson.dumps({"method": "subscribeNewToken"}).decode())
+                    logger.info("Souscription aux nouveaux tokens envoyée")
+                    async for message in ws:
+                        try:
+                            self._queue.put_nowait(message)
+                        except asyncio.QueueFull:
+                            self._dropped += 1
+                            if self._dropped % 100 == 1:
+                                logger.warning("File de messages pleine, %s message(s) ignoré(s)", self._dropped)
+                logger.warning("WebSocket fermé")
+            except asyncio.CancelledError:
+                raise
+            except websockets.ConnectionClosed as e:
+                logger.warning("WebSocket fermé: %s - %s", e.code, e.reason)
             except Exception as e:
-                logging.error(f"Erreur de connexion WebSocket: {e}")
-            logging.info("Tentative de reconnexion WebSocket dans 10 secondes...")
-            time.sleep(10)
+                logger.error("Erreur de connexion WebSocket: %s", e)
+            logger.info("Tentative de reconnexion WebSocket dans 10 secondes...")
+            await asyncio.sleep(10)
 
 def main():
     """Fonction principale"""
@@ -296,5 +509,5 @@ def main():
     bot.run(DISCORD_TOKEN)
 
 if __name__ == "__main__":
-    logging.info("Démarrage du TweetCatcher...")
+    logger.info("Démarrage du TweetCatcher...")
     main()